@@ -228,8 +228,14 @@ CREATE INDEX IF NOT EXISTS idx_oauth_clients_id           ON oauth_clients(id);
 
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_users_verification_token ON users(verification_token);
+-- Email lookups are case-insensitive: LOWER(email) = LOWER(%(email)s)
+CREATE INDEX IF NOT EXISTS idx_users_email_lower ON users(LOWER(email));
+-- Tokens are NULLed once verified, so only pending rows need indexing
+CREATE INDEX IF NOT EXISTS idx_users_verification_token_pending ON users(verification_token)
+    WHERE verification_token IS NOT NULL;
+-- Serves list_users(admin_only=True) without scanning every user
+CREATE INDEX IF NOT EXISTS idx_users_admins ON users(created_at DESC)
+    WHERE 'admin' = ANY(scopes);
 CREATE INDEX IF NOT EXISTS idx_api_keys_key_hash ON api_keys(key_hash);
 CREATE INDEX IF NOT EXISTS idx_api_keys_is_active ON api_keys(is_active);
 CREATE INDEX IF NOT EXISTS idx_api_keys_created_by ON api_keys(created_by);
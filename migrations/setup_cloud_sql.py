@@ -51,7 +51,13 @@ CREATE TABLE IF NOT EXISTS api_keys (
 CREATE INDEX IF NOT EXISTS idx_api_keys_key_hash ON api_keys(key_hash);
 CREATE INDEX IF NOT EXISTS idx_api_keys_is_active ON api_keys(is_active);
 CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+DROP INDEX IF EXISTS idx_users_email;
+DROP INDEX IF EXISTS idx_users_verification_token;
+CREATE INDEX IF NOT EXISTS idx_users_email_lower ON users(LOWER(email));
+CREATE INDEX IF NOT EXISTS idx_users_verification_token_pending ON users(verification_token)
+    WHERE verification_token IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_users_admins ON users(created_at DESC)
+    WHERE 'admin' = ANY(scopes);
 """
 
 
@@ -4,7 +4,7 @@ import secrets
 import hashlib
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
-from src.db_service import DatabaseService
+from src.db_service import db_service
 
 
 class APIKeyService:
@@ -12,7 +12,7 @@ class APIKeyService:
     
     def __init__(self):
         """Initialize the API key service."""
-        self.db = DatabaseService()
+        self.db = db_service
     
     def generate_api_key(self) -> str:
         """
@@ -198,7 +198,7 @@ class APIKeyService:
             """
             params = {}
         
-        results = self.db.execute_query(query, params)
+        result = self.db.execute_query(query, params)
         
         return [
             {
@@ -212,7 +212,7 @@ class APIKeyService:
                 "expires_at": row['expires_at'].isoformat() if row['expires_at'] else None,
                 "created_at": row['created_at'].isoformat(),
             }
-            for row in results
+            for row in result.get("results", [])
         ]
     
     def revoke_api_key(self, key_id: int, revoked_by: Optional[str] = None) -> bool:
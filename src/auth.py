@@ -65,7 +65,7 @@ def authenticate_user(username: str, password: str) -> Optional[User]:
     """
     # Try database authentication first
     try:
-        from src.user_service import UserService
+        from src.user_service import UserService, password_needs_rehash
         user_service = UserService()
         user_dict = user_service.get_user_by_username(username)
         
@@ -74,8 +74,12 @@ def authenticate_user(username: str, password: str) -> Optional[User]:
             if user_dict.get("disabled", False):
                 return None
             
-            # Verify password
-            if verify_password(password, user_dict["hashed_password"]):
+            # Verify password (argon2id, or bcrypt for accounts not yet migrated)
+            if user_service.verify_password(password, user_dict["hashed_password"]):
+                if password_needs_rehash(user_dict["hashed_password"]):
+                    user_service.schedule_password_rehash(
+                        username, password, user_dict["hashed_password"]
+                    )
                 # Return User object without password
                 user_data = user_dict.copy()
                 user_data.pop("hashed_password", None)
@@ -47,12 +47,11 @@ def _err(source: str, exc: Exception) -> dict:
 
 def _upsert_accounts(rows: list[dict]) -> int:
     """Upsert a list of account dicts into the customers table."""
-    from src.db_service import DatabaseService
+    from src.db_service import db_service as db
 
     if not rows:
         return 0
 
-    db = DatabaseService()
     count = 0
     for row in rows:
         query = """
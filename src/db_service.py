@@ -1,9 +1,15 @@
 """PostgreSQL database service for executing queries."""
 
-import psycopg2
+import asyncio
+import json
+import threading
+import weakref
+import asyncpg
 from psycopg2 import sql, Error
+from psycopg2.extensions import connection as PgConnection
 from psycopg2.extras import RealDictCursor
-from typing import List, Dict, Any, Optional
+from psycopg2.pool import ThreadedConnectionPool
+from typing import List, Dict, Any, Iterator, Optional
 from contextlib import contextmanager
 import logging
 from src.config import settings
@@ -11,6 +17,18 @@ from src.config import settings
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Size of the psycopg2 pool. Callers beyond this wait for a free connection
+# rather than failing with PoolError.
+_POOL_MAX_CONNECTIONS = 20
+
+
+class _PreparingConnection(PgConnection):
+    """psycopg2 connection that remembers which named statements it has prepared."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: set = set()
+
 
 class DatabaseService:
     """Service for executing PostgreSQL queries."""
@@ -38,28 +56,58 @@ class DatabaseService:
                 "password": settings.postgres_password,
             }
             logger.info(f"DatabaseService initialized with TCP: {settings.postgres_host}:{settings.postgres_port}")
+        
+        # psycopg2 pool (created lazily so importing this module never connects)
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool.getconn() raises once every connection is
+        # out; this makes the auth, hashing and email workers queue instead
+        self._pool_slots = threading.BoundedSemaphore(_POOL_MAX_CONNECTIONS)
+        
+        # asyncpg pools, one per event loop since a pool can't cross loops.
+        # Each maps to (pool creation task, task that closes the pool when the
+        # loop shuts down).
+        self._async_pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            tuple["asyncio.Task[asyncpg.Pool]", "asyncio.Task[None]"],
+        ] = weakref.WeakKeyDictionary()
+    
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Return the psycopg2 connection pool, creating it on first use."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(
+                        minconn=1,
+                        maxconn=_POOL_MAX_CONNECTIONS,
+                        connection_factory=_PreparingConnection,
+                        **self.connection_params,
+                    )
+        return self._pool
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = None
-        try:
-            conn = psycopg2.connect(**self.connection_params)
-            yield conn
-            conn.commit()
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            raise e
-        finally:
-            if conn:
-                conn.close()
+        """Context manager for pooled database connections."""
+        pool = self._get_pool()
+        with self._pool_slots:
+            conn = pool.getconn()
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                if not conn.closed:
+                    conn.rollback()
+                raise e
+            finally:
+                # Drop broken connections instead of handing them to the next caller
+                pool.putconn(conn, close=bool(conn.closed))
     
     def execute_query(
         self, 
         query: str, 
         params: Optional[tuple] = None,
-        fetch_results: bool = True
+        fetch_results: bool = True,
+        statement_name: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Execute a SQL query against the PostgreSQL database.
@@ -68,6 +116,10 @@ class DatabaseService:
             query: SQL query to execute
             params: Optional tuple of parameters for parameterized queries
             fetch_results: Whether to fetch and return results (for SELECT queries)
+            statement_name: Run the query as a server-side prepared statement
+                under this name, preparing it once per pooled connection.
+                The query must then use $1, $2, ... placeholders and params
+                must be a tuple.
         
         Returns:
             Dictionary with success status, results, and metadata
@@ -76,7 +128,10 @@ class DatabaseService:
             with self.get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                     # Execute the query
-                    cursor.execute(query, params)
+                    if statement_name:
+                        self._execute_prepared(conn, cursor, statement_name, query, params or ())
+                    else:
+                        cursor.execute(query, params)
                     
                     result = {
                         "success": True,
@@ -111,6 +166,165 @@ class DatabaseService:
                 "rowcount": 0,
             }
     
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        itersize: int = 1000,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the rows of a SELECT through a server-side cursor.
+        
+        Rows arrive from PostgreSQL `itersize` at a time, so memory use does
+        not grow with the size of the result. The pooled connection is held
+        until the iterator is exhausted or closed. Unlike execute_query,
+        errors are raised rather than returned.
+        
+        Args:
+            query: SQL query to execute
+            params: Optional tuple of parameters for parameterized queries
+            itersize: Number of rows fetched per round trip
+        
+        Yields:
+            One dict-like row per result row
+        """
+        with self.get_connection() as conn:
+            with conn.cursor(name="iter_query", cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = itersize
+                cursor.execute(query, params)
+                yield from cursor
+    
+    @staticmethod
+    def _execute_prepared(conn, cursor, name: str, query: str, params: tuple) -> None:
+        """EXECUTE a named statement, issuing PREPARE first if this connection lacks it."""
+        if name not in conn.prepared_statements:
+            cursor.execute(f"PREPARE {name} AS {query}")
+            conn.prepared_statements.add(name)
+        if params:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+    
+    @staticmethod
+    async def _init_async_connection(conn: asyncpg.Connection) -> None:
+        """Decode json/jsonb columns to Python objects, matching psycopg2."""
+        for typename in ("json", "jsonb"):
+            await conn.set_type_codec(
+                typename,
+                encoder=json.dumps,
+                decoder=json.loads,
+                schema="pg_catalog",
+            )
+    
+    async def _get_async_pool(self) -> asyncpg.Pool:
+        """Return the asyncpg pool for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        entry = self._async_pools.get(loop)
+        if entry is None:
+            # Store the creation task so concurrent first callers share one pool
+            pool_task = loop.create_task(self._create_async_pool())
+            closer = loop.create_task(self._close_async_pool_on_shutdown(loop, pool_task))
+            entry = self._async_pools[loop] = (pool_task, closer)
+        pool_task, closer = entry
+        try:
+            return await pool_task
+        except Exception:
+            # Let the next call retry instead of re-raising a cached failure
+            if self._async_pools.get(loop) is entry:
+                del self._async_pools[loop]
+            closer.cancel()
+            raise
+    
+    async def _create_async_pool(self) -> asyncpg.Pool:
+        # create_pool() returns an awaitable Pool, not a coroutine, so it
+        # can't be handed to create_task() directly
+        return await asyncpg.create_pool(
+            min_size=1,
+            max_size=10,
+            init=self._init_async_connection,
+            **self.connection_params,
+        )
+    
+    async def _close_async_pool_on_shutdown(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pool_task: "asyncio.Task[asyncpg.Pool]",
+    ) -> None:
+        """Wait until the loop shuts down, then close that loop's pool.
+        
+        asyncio.run() cancels pending tasks before closing its loop, which is
+        what wakes this up; without it every asyncio.run() would leak the
+        pool's connections.
+        """
+        try:
+            await asyncio.Event().wait()
+        finally:
+            entry = self._async_pools.get(loop)
+            if entry is not None and entry[0] is pool_task:
+                del self._async_pools[loop]
+            if pool_task.done() and not pool_task.cancelled() and pool_task.exception() is None:
+                pool_task.result().terminate()
+    
+    async def execute_query_async(
+        self,
+        query: str,
+        *params: Any,
+        fetch_results: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Execute a SQL query using the asyncpg connection pool.
+        
+        Same result shape as execute_query, but parameters use PostgreSQL's
+        positional placeholders ($1, $2, ...) instead of psycopg2's %s style.
+        
+        Args:
+            query: SQL query to execute
+            *params: Positional parameters for $1, $2, ... placeholders
+            fetch_results: Whether to fetch and return results (for SELECT queries)
+        
+        Returns:
+            Dictionary with success status, results, and metadata
+        """
+        try:
+            pool = await self._get_async_pool()
+            async with pool.acquire() as conn:
+                if fetch_results:
+                    statement = await conn.prepare(query)
+                    rows = await statement.fetch(*params)
+                    return {
+                        "success": True,
+                        "rowcount": len(rows),
+                        "results": [dict(row) for row in rows],
+                        "column_names": [attr.name for attr in statement.get_attributes()],
+                    }
+                
+                # Command status looks like "UPDATE 3" / "INSERT 0 1"
+                status = await conn.execute(query, *params)
+                last = status.rsplit(" ", 1)[-1]
+                return {
+                    "success": True,
+                    "rowcount": int(last) if last.isdigit() else -1,
+                    "results": [],
+                    "column_names": [],
+                }
+        
+        except asyncpg.PostgresError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "results": [],
+                "rowcount": 0,
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Unexpected error: {str(e)}",
+                "error_type": type(e).__name__,
+                "results": [],
+                "rowcount": 0,
+            }
+    
     def test_connection(self) -> Dict[str, Any]:
         """
         Test the database connection.
@@ -139,6 +353,31 @@ class DatabaseService:
                 "connected": False,
                 "error": str(e),
             }
+    
+    async def test_connection_async(self) -> Dict[str, Any]:
+        """
+        Test the database connection using the asyncpg pool.
+        
+        Returns:
+            Dictionary with connection status and database info
+        """
+        result = await self.execute_query_async(
+            "SELECT version() AS version, current_database() AS database"
+        )
+        if not result["success"]:
+            return {
+                "success": False,
+                "connected": False,
+                "error": result["error"],
+            }
+        
+        row = result["results"][0]
+        return {
+            "success": True,
+            "connected": True,
+            "database": row["database"],
+            "version": row["version"],
+        }
 
 
 # Global database service instance
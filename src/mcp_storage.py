@@ -4,7 +4,7 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import uuid
 import json
-from src.db_service import DatabaseService
+from src.db_service import db_service
 from src.models import (
     CallToAction,
     HealthScore,
@@ -22,7 +22,7 @@ class MCPStorage:
     
     def __init__(self):
         """Initialize PostgreSQL storage."""
-        self.db = DatabaseService()
+        self.db = db_service
     
     # ========================================================================
     # CALL TO ACTIONS
@@ -1,8 +1,10 @@
 """Customer Success MCP Server - Main server implementation."""
 
 import asyncio
+import copy
 import logging
 import os
+import re
 import secrets
 import sys
 import time
@@ -643,8 +645,37 @@ def get_risk_alert(alert_id: str) -> dict[str, Any]:
 # DATABASE QUERY TOOLS
 # ============================================================================
 
+# Schema introspection cache: (database, kind, table) -> (cached_at, result)
+_SCHEMA_CACHE_TTL = 60              # seconds — schemas change rarely
+_SCHEMA_CACHE_MAX_ENTRIES = 64
+_schema_cache: dict[tuple, tuple[float, dict]] = {}
+
+# Write/DDL statements rejected by query_database, matched as whole words
+_WRITE_KEYWORD_RE = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|CREATE|DROP|ALTER|TRUNCATE|REPLACE|GRANT|REVOKE)\b"
+)
+
+
+def _schema_cache_get(key: tuple) -> Optional[dict]:
+    """Return a copy of a cached schema result if it is still fresh."""
+    entry = _schema_cache.get(key)
+    if entry is None:
+        return None
+    if time.time() - entry[0] > _SCHEMA_CACHE_TTL:
+        del _schema_cache[key]
+        return None
+    return copy.deepcopy(entry[1])
+
+
+def _schema_cache_set(key: tuple, value: dict) -> None:
+    """Cache a copy of a schema result, evicting the oldest entry when full."""
+    if key not in _schema_cache and len(_schema_cache) >= _SCHEMA_CACHE_MAX_ENTRIES:
+        del _schema_cache[next(iter(_schema_cache))]
+    _schema_cache[key] = (time.time(), copy.deepcopy(value))
+
+
 @mcp.tool()
-def query_database(
+async def query_database(
     query: str,
     fetch_results: bool = True,
     max_rows: int = 10000,
@@ -692,24 +723,14 @@ def query_database(
     # STRICT validation - only allow SELECT queries (read-only)
     query_upper = query.strip().upper()
     
-    # Block ALL write operations
-    write_keywords = [
-        'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'CREATE', 'DROP', 
-        'ALTER', 'TRUNCATE', 'REPLACE', 'GRANT', 'REVOKE'
-    ]
-    
-    for keyword in write_keywords:
-        # Check if the keyword appears as a statement (not in strings or table names)
-        if keyword in query_upper:
-            # More precise check: keyword followed by whitespace or specific SQL keywords
-            import re
-            pattern = rf'\b{keyword}\b'
-            if re.search(pattern, query_upper):
-                return {
-                    "success": False,
-                    "error": f"Write operation '{keyword}' is not allowed. This tool is READ-ONLY.",
-                    "results": [],
-                }
+    # Block ALL write operations (keyword as a whole word, not inside table names)
+    write_match = _WRITE_KEYWORD_RE.search(query_upper)
+    if write_match:
+        return {
+            "success": False,
+            "error": f"Write operation '{write_match.group(1)}' is not allowed. This tool is READ-ONLY.",
+            "results": [],
+        }
     
     # Ensure query starts with SELECT, WITH, or is a comment
     query_start = query_upper.lstrip()
@@ -732,7 +753,7 @@ def query_database(
         else:
             modified_query = query
         
-        result = db_service.execute_query(modified_query, fetch_results=fetch_results)
+        result = await db_service.execute_query_async(modified_query, fetch_results=fetch_results)
         
         # Check if results were truncated
         if result.get("success") and fetch_results:
@@ -763,7 +784,7 @@ def query_database(
 
 
 @mcp.tool()
-def test_database_connection() -> dict[str, Any]:
+async def test_database_connection() -> dict[str, Any]:
     """
     Test the PostgreSQL database connection and retrieve database information.
     
@@ -774,12 +795,12 @@ def test_database_connection() -> dict[str, Any]:
         Connection status and database information
     """
     try:
-        result = db_service.test_connection()
+        result = await db_service.test_connection_async()
         if not result.get("success"):
             return result
         
         # Also return user count for extra context
-        user_result = db_service.execute_query("SELECT COUNT(*) as count FROM users;")
+        user_result = await db_service.execute_query_async("SELECT COUNT(*) as count FROM users;")
         user_count = user_result["results"][0]["count"] if user_result.get("success") and user_result.get("results") else 0
         
         return {
@@ -795,7 +816,7 @@ def test_database_connection() -> dict[str, Any]:
 
 
 @mcp.tool()
-def get_all_database_tables() -> dict[str, Any]:
+async def get_all_database_tables() -> dict[str, Any]:
     """
     List all tables in the current PostgreSQL database schema.
     
@@ -805,6 +826,11 @@ def get_all_database_tables() -> dict[str, Any]:
     Returns:
         List of tables with metadata
     """
+    cache_key = (settings.postgres_db, "tables", None)
+    cached = _schema_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         tables_query = """
             SELECT
@@ -816,7 +842,17 @@ def get_all_database_tables() -> dict[str, Any]:
             WHERE t.table_schema = 'public'
             ORDER BY t.table_name;
         """
-        tables_result = db_service.execute_query(tables_query, fetch_results=True)
+        # Fetch columns for every table in one pass instead of one query per table
+        columns_query = """
+            SELECT table_name, column_name, data_type, is_nullable, column_default
+            FROM information_schema.columns
+            WHERE table_schema = 'public'
+            ORDER BY table_name, ordinal_position;
+        """
+        tables_result, columns_result = await asyncio.gather(
+            db_service.execute_query_async(tables_query),
+            db_service.execute_query_async(columns_query),
+        )
         
         if not tables_result.get("success"):
             return {
@@ -824,34 +860,38 @@ def get_all_database_tables() -> dict[str, Any]:
                 "error": tables_result.get("error", "Failed to retrieve tables"),
                 "tables": [],
             }
+        if not columns_result.get("success"):
+            return {
+                "success": False,
+                "error": columns_result.get("error", "Failed to retrieve columns"),
+                "tables": [],
+            }
+        
+        columns_by_table: dict[str, list[dict[str, Any]]] = {}
+        for column in columns_result.get("results", []):
+            table_name = column.pop("table_name")
+            columns_by_table.setdefault(table_name, []).append(column)
         
         tables = tables_result.get("results", [])
         tables_with_columns = []
         
         for table in tables:
             table_name = table.get("table_name")
-            columns_query = """
-                SELECT column_name, data_type, is_nullable, column_default
-                FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = %s
-                ORDER BY ordinal_position;
-            """
-            columns_result = db_service.execute_query(columns_query, params=(table_name,), fetch_results=True)
-            columns = columns_result.get("results", [])
-            
             tables_with_columns.append({
                 "table_name": table_name,
                 "table_type": table.get("table_type"),
                 "row_count_estimate": table.get("row_count_estimate", 0),
-                "columns": columns,
+                "columns": columns_by_table.get(table_name, []),
             })
         
-        return {
+        result = {
             "success": True,
             "database": settings.postgres_db,
             "table_count": len(tables_with_columns),
             "tables": tables_with_columns,
         }
+        _schema_cache_set(cache_key, result)
+        return result
     
     except Exception as e:
         return {
@@ -862,7 +902,7 @@ def get_all_database_tables() -> dict[str, Any]:
 
 
 @mcp.tool()
-def get_table_schema(table_name: str) -> dict[str, Any]:
+async def get_table_schema(table_name: str) -> dict[str, Any]:
     """
     Get the schema/structure of a specific table including columns and data types.
     
@@ -888,12 +928,17 @@ def get_table_schema(table_name: str) -> dict[str, Any]:
             character_maximum_length,
             ordinal_position
         FROM information_schema.columns
-        WHERE table_schema = 'public' AND table_name = %s
+        WHERE table_schema = 'public' AND table_name = $1
         ORDER BY ordinal_position;
     """
     
+    cache_key = (settings.postgres_db, "schema", table_name)
+    cached = _schema_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        result = db_service.execute_query(query, params=(table_name,), fetch_results=True)
+        result = await db_service.execute_query_async(query, table_name)
         
         if result["success"] and not result.get("results"):
             return {
@@ -902,12 +947,15 @@ def get_table_schema(table_name: str) -> dict[str, Any]:
                 "results": [],
             }
         
-        return {
+        schema = {
             "success": result["success"],
             "table_name": table_name,
             "column_count": len(result.get("results", [])),
             "columns": result.get("results", []),
         }
+        if schema["success"]:
+            _schema_cache_set(cache_key, schema)
+        return schema
     except Exception as e:
         return {
             "success": False,
@@ -916,6 +964,26 @@ def get_table_schema(table_name: str) -> dict[str, Any]:
         }
 
 
+@mcp.tool()
+def clear_schema_cache() -> dict[str, Any]:
+    """
+    Clear cached table listings and table schemas.
+    
+    get_all_database_tables and get_table_schema cache their results for
+    60 seconds. Call this after creating, altering, or dropping tables so
+    the next call reads fresh metadata from the database.
+    
+    Returns:
+        Number of cache entries cleared
+    """
+    cleared = len(_schema_cache)
+    _schema_cache.clear()
+    return {
+        "success": True,
+        "cleared_entries": cleared,
+    }
+
+
 # ============================================================================
 # CRM SYNC TOOLS
 # ============================================================================
@@ -1314,8 +1382,8 @@ function randomUUID() {{
             )
             return HTMLResponse(html, status_code=401)
 
-        # Authenticate user
-        user = authenticate_user(username, password)
+        # Authenticate user (bcrypt + DB lookup; keep it off the event loop)
+        user = await asyncio.to_thread(authenticate_user, username, password)
         if not user:
             return _show_error("Invalid username or password.")
 
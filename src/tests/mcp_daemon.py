@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test daemon that keeps one stdio MCP server hot between test runs.
+
+Run `python -m src.tests.mcp_daemon` once; MCPStdioClient then connects to
+its Unix socket instead of starting a fresh server for every run. Request
+ids are rewritten so several clients can share the server at once.
+"""
+
+import itertools
+import json
+import os
+import selectors
+import socket
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+from src.tests.test_mcp_client import DAEMON_SOCKET, spawn_server
+
+
+class MCPTestDaemon:
+    """Multiplex newline-delimited JSON-RPC from socket clients onto one server."""
+
+    def __init__(self, socket_path: str = DAEMON_SOCKET):
+        """Start the MCP server and listen on the Unix socket."""
+        self.socket_path = socket_path
+        self.process = spawn_server()
+        self._server_in = self.process.stdin.fileno()
+        self._server_out = self.process.stdout.fileno()
+        os.set_blocking(self._server_in, False)
+        os.set_blocking(self._server_out, False)
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(socket_path)
+        self.listener.listen()
+        self.listener.setblocking(False)
+
+        self._next_id = itertools.count(1).__next__
+        # daemon request id -> (client socket, client's own request id)
+        self._routes: Dict[int, Tuple[socket.socket, int]] = {}
+        # Partial lines read from each client / from the server
+        self._buffers: Dict[socket.socket, bytearray] = {}
+        self._server_buffer = bytearray()
+        # Bytes not yet written to each client / to the server, so a slow
+        # reader on either side never blocks the relay
+        self._outgoing: Dict[socket.socket, bytearray] = {}
+        self._server_outgoing = bytearray()
+
+        # Each key's data is its (on readable, on writable) handlers
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ, (self._accept, None))
+        self.selector.register(self._server_out, selectors.EVENT_READ, (self._read_server, None))
+
+    def _accept(self, listener: socket.socket):
+        """Register a newly connected test client."""
+        conn, _ = listener.accept()
+        conn.setblocking(False)
+        self._buffers[conn] = bytearray()
+        self._outgoing[conn] = bytearray()
+        self.selector.register(conn, selectors.EVENT_READ, (self._read_client, self._flush_client))
+
+    def _drop_client(self, conn: socket.socket):
+        """Forget a disconnected client; responses still in flight are discarded."""
+        self.selector.unregister(conn)
+        del self._buffers[conn]
+        del self._outgoing[conn]
+        conn.close()
+
+    def _read_client(self, conn: socket.socket):
+        """Forward complete requests from a client, rewriting their ids."""
+        if conn not in self._buffers:
+            return  # dropped earlier in this select() round
+        try:
+            chunk = conn.recv(65536)
+        except ConnectionError:
+            chunk = b""
+        if not chunk:
+            self._drop_client(conn)
+            return
+
+        buffer = self._buffers[conn]
+        buffer += chunk
+        *lines, rest = buffer.split(b"\n")
+        self._buffers[conn] = bytearray(rest)
+
+        out = []
+        for line in lines:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if "id" in message:
+                daemon_id = self._next_id()
+                self._routes[daemon_id] = (conn, message["id"])
+                message["id"] = daemon_id
+            out.append(json.dumps(message).encode() + b"\n")
+
+        if out:
+            self._send_to_server(b"".join(out))
+
+    def _send_to_server(self, data: bytes):
+        """Queue requests for the server and write what its stdin takes now."""
+        pending = bool(self._server_outgoing)
+        self._server_outgoing += data
+        if not pending:
+            self._flush_server(self._server_in)
+
+    def _flush_server(self, fd: int):
+        """Write queued requests, watching for writability while any remain."""
+        try:
+            written = os.write(fd, self._server_outgoing)
+        except BlockingIOError:
+            written = 0
+        del self._server_outgoing[:written]
+
+        watching = fd in self.selector.get_map()
+        if self._server_outgoing and not watching:
+            self.selector.register(fd, selectors.EVENT_WRITE, (None, self._flush_server))
+        elif not self._server_outgoing and watching:
+            self.selector.unregister(fd)
+
+    def _read_server(self, fd: int):
+        """Route server responses back to the client that sent the request."""
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            raise RuntimeError("MCP server exited")
+
+        self._server_buffer += chunk
+        *lines, rest = self._server_buffer.split(b"\n")
+        self._server_buffer = bytearray(rest)
+
+        replies: Dict[socket.socket, list] = {}
+        for line in lines:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            # Server notifications/requests have no client to go to
+            route = self._routes.pop(message.get("id"), None)
+            if route is None or "method" in message:
+                continue
+            conn, client_id = route
+            if conn not in self._buffers:
+                continue
+            message["id"] = client_id
+            replies.setdefault(conn, []).append(json.dumps(message).encode() + b"\n")
+
+        for conn, out in replies.items():
+            if conn in self._buffers:
+                self._send_to_client(conn, b"".join(out))
+
+    def _send_to_client(self, conn: socket.socket, data: bytes):
+        """Queue responses for a client and send what its socket takes now."""
+        outgoing = self._outgoing[conn]
+        pending = bool(outgoing)
+        outgoing += data
+        if not pending:
+            self._flush_client(conn)
+
+    def _flush_client(self, conn: socket.socket):
+        """Send queued responses, watching for writability while any remain."""
+        if conn not in self._buffers:
+            return  # dropped earlier in this select() round
+        outgoing = self._outgoing[conn]
+        try:
+            sent = conn.send(outgoing)
+        except BlockingIOError:
+            sent = 0
+        except ConnectionError:
+            self._drop_client(conn)
+            return
+        del outgoing[:sent]
+
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if outgoing else 0)
+        if self.selector.get_key(conn).events != events:
+            self.selector.modify(conn, events, (self._read_client, self._flush_client))
+
+    def serve_forever(self):
+        """Relay messages until interrupted or the server exits."""
+        try:
+            while True:
+                for key, events in self.selector.select():
+                    on_read, on_write = key.data
+                    if events & selectors.EVENT_WRITE:
+                        on_write(key.fileobj)
+                    if events & selectors.EVENT_READ:
+                        on_read(key.fileobj)
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop the server and remove the socket file."""
+        self.selector.close()
+        self.listener.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+if __name__ == "__main__":
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else DAEMON_SOCKET
+    daemon = MCPTestDaemon(socket_path)
+    print(f"🚀 MCP test daemon listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 MCP test daemon stopped")
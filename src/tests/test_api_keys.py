@@ -0,0 +1,213 @@
+"""Test script for API key creation and validation."""
+
+import asyncio
+import sys
+import time
+
+from psycopg2.extras import execute_values
+
+from src.api_key_service import APIKeyService
+
+# p95 budget for a single validate_api_key call (hash + lookup + last_used update)
+_VALIDATION_P95_SECONDS = 0.1
+# Median budgets for the pytest-benchmark regression tests (pooled connection)
+_VALIDATION_MEDIAN_SECONDS = 0.01
+_LIST_KEYS_MEDIAN_SECONDS = 0.02
+_SELECT_ONE_MEDIAN_SECONDS = 0.005
+_SEP60 = "=" * 60
+
+
+def _bulk_create_keys(service: APIKeyService, n: int = 100) -> tuple[list[str], list[int]]:
+    """
+    Create ``n`` API keys with a single multi-row INSERT.
+
+    Keys are generated locally and inserted in one round trip instead of
+    calling ``create_api_key`` ``n`` times.
+
+    Returns:
+        Tuple of (plaintext keys, database ids)
+    """
+    keys = [service.generate_api_key() for _ in range(n)]
+    rows = [
+        (
+            service.hash_api_key(key),
+            service.get_key_prefix(key),
+            f"throughput-test-{i}",
+            "Created by test_api_keys.py",
+            "test",
+            True,
+        )
+        for i, key in enumerate(keys)
+    ]
+
+    with service.db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            inserted = execute_values(
+                cursor,
+                """
+                INSERT INTO api_keys (
+                    key_hash, key_prefix, name, description, created_by, is_active
+                ) VALUES %s
+                RETURNING id
+                """,
+                rows,
+                fetch=True,
+            )
+
+    return keys, [row[0] for row in inserted]
+
+
+def _delete_keys(service: APIKeyService, key_ids: list[int]) -> None:
+    """Remove keys created by these tests."""
+    service.db.execute_query(
+        "DELETE FROM api_keys WHERE id = ANY(%(ids)s)",
+        {"ids": key_ids},
+    )
+
+
+def test_api_key_validation():
+    """Test that a created key validates and an unknown key does not."""
+    out = []
+    out.append(_SEP60)
+    out.append("API Key Validation - Testing")
+    out.append(_SEP60)
+
+    service = APIKeyService()
+
+    # Test 1: Create a key
+    out.append("\n1️⃣  Creating API key...")
+    try:
+        created = service.create_api_key(
+            name="validation-test",
+            description="Created by test_api_keys.py",
+            created_by="test",
+        )
+    except Exception as e:
+        out.append(f"   ❌ Failed to create API key: {e}")
+        sys.stdout.write("\n".join(out) + "\n")
+        return
+    out.append(f"   ✓ Key created: {created['key_prefix']}... (id {created['id']})")
+
+    try:
+        # Test 2: Valid key
+        out.append("\n2️⃣  Validating the new key...")
+        info = service.validate_api_key(created["api_key"])
+        assert info is not None, "Valid key was rejected"
+        out.append(f"   ✓ Valid key accepted: {info['name']}")
+
+        # Test 3: Invalid key
+        out.append("\n3️⃣  Validating an unknown key...")
+        info = service.validate_api_key("csm_live_INVALID")
+        assert info is None, "Invalid key was accepted"
+        out.append("   ✓ Invalid key rejected")
+    finally:
+        service.delete_api_key(created["id"])
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+def test_validation_throughput():
+    """Validate a pool of keys repeatedly and check p95 latency."""
+    out = []
+    out.append(_SEP60)
+    out.append("API Key Validation - Throughput")
+    out.append(_SEP60)
+
+    service = APIKeyService()
+
+    out.append("\n1️⃣  Creating key pool...")
+    try:
+        keys, key_ids = _bulk_create_keys(service, n=100)
+    except Exception as e:
+        out.append(f"   ❌ Failed to create key pool: {e}")
+        sys.stdout.write("\n".join(out) + "\n")
+        return
+    out.append(f"   ✓ Created {len(keys)} keys in one INSERT")
+
+    try:
+        out.append(f"\n2️⃣  Running {len(keys) * 10} validations...")
+        latencies = []
+        for key in keys * 10:
+            start = time.perf_counter()
+            info = service.validate_api_key(key)
+            latencies.append(time.perf_counter() - start)
+            assert info is not None, "Pooled key was rejected"
+
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[int(len(latencies) * 0.95)]
+        out.append(f"   ✓ p50: {p50 * 1000:.2f} ms")
+        out.append(f"   ✓ p95: {p95 * 1000:.2f} ms")
+        assert p95 < _VALIDATION_P95_SECONDS, (
+            f"validate_api_key p95 {p95 * 1000:.2f} ms exceeds "
+            f"{_VALIDATION_P95_SECONDS * 1000:.0f} ms"
+        )
+    finally:
+        _delete_keys(service, key_ids)
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+def test_validate_api_key_benchmark(benchmark):
+    """Lock in validate_api_key latency so per-call regressions fail CI."""
+    service = APIKeyService()
+    keys, key_ids = _bulk_create_keys(service, n=1)
+    try:
+        info = benchmark.pedantic(
+            service.validate_api_key, args=(keys[0],), rounds=200, iterations=1
+        )
+        assert info is not None, "Pooled key was rejected"
+        assert benchmark.stats.stats.median < _VALIDATION_MEDIAN_SECONDS
+    finally:
+        _delete_keys(service, key_ids)
+
+
+def test_list_api_keys_benchmark(benchmark):
+    """Lock in list_api_keys latency."""
+    service = APIKeyService()
+    _, key_ids = _bulk_create_keys(service, n=1)
+    try:
+        keys = benchmark.pedantic(service.list_api_keys, rounds=100, iterations=1)
+        assert key_ids[0] in {key["id"] for key in keys}, "Created key missing from listing"
+        assert benchmark.stats.stats.median < _LIST_KEYS_MEDIAN_SECONDS
+    finally:
+        _delete_keys(service, key_ids)
+
+
+def test_execute_query_benchmark(benchmark):
+    """Lock in the round-trip cost of a trivial query on a pooled connection."""
+    service = APIKeyService()
+    result = benchmark.pedantic(
+        service.db.execute_query, args=("SELECT 1 as test",), rounds=200, iterations=1
+    )
+    assert result["success"], result.get("error")
+    assert benchmark.stats.stats.median < _SELECT_ONE_MEDIAN_SECONDS
+
+
+async def main():
+    """Run all API key tests."""
+    service = APIKeyService()
+
+    # Pay the Postgres handshake in the background while the banner prints
+    db_ready = asyncio.create_task(
+        asyncio.to_thread(service.db.execute_query, "SELECT 1 as test", fetch_results=True)
+    )
+
+    print("\n🔑 API Key Service Tests\n")
+
+    result = await db_ready
+    if not result["success"]:
+        print(f"❌ Database connection failed: {result.get('error', 'Unknown error')}")
+        print("   API key tests require PostgreSQL (see .env.example)")
+        return
+
+    print("✓ Database connection OK\n")
+    test_api_key_validation()
+    print()
+    test_validation_throughput()
+
+    print("\n" + _SEP60)
+    print("✅ API Key Testing Complete")
+    print(_SEP60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,9 +5,32 @@ import requests
 import sys
 from typing import Any, Dict
 
+try:
+    import orjson
+except ImportError:  # optional; the stdlib codec is used instead
+    orjson = None
+
 # Your Cloud Run URL
 SERVICE_URL = "https://your-mcp-server-url.run.app"
 
+_SEP70 = "=" * 70
+# Shared read-only default for dict.get() so misses don't allocate a new dict
+_EMPTY: Dict[str, Any] = {}
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Encode a JSON request body, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+
+def _loads(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 class CloudMCPClient:
     """MCP client for testing Cloud Run SSE deployment."""
@@ -33,7 +56,7 @@ class CloudMCPClient:
         try:
             response = self.session.post(
                 f"{self.server_url}/messages",
-                json=payload,
+                data=_dumps(payload),
                 headers={
                     "Content-Type": "application/json",
                     "Accept": "application/json"
@@ -42,7 +65,7 @@ class CloudMCPClient:
             )
             
             if response.status_code == 200:
-                return response.json()
+                return _loads(response.content)
             else:
                 return {
                     "error": f"HTTP {response.status_code}: {response.text[:200]}"
@@ -53,78 +76,85 @@ class CloudMCPClient:
 
 def test_health_and_endpoints():
     """Test basic endpoints."""
-    print("=" * 70)
-    print("Testing MCP Server on Cloud Run")
-    print("=" * 70)
-    print(f"\n📍 Service URL: {SERVICE_URL}\n")
+    # Collect the report and emit it in one write instead of a print() per line
+    out = []
+    out.append(_SEP70)
+    out.append("Testing MCP Server on Cloud Run")
+    out.append(_SEP70)
+    out.append(f"\n📍 Service URL: {SERVICE_URL}\n")
     
     # Test 1: Health endpoint
-    print("1️⃣  Testing health endpoint...")
+    out.append("1️⃣  Testing health endpoint...")
     try:
         response = requests.get(f"{SERVICE_URL}/health", timeout=5)
         if response.status_code == 200:
-            data = response.json()
-            print(f"   ✅ Health check passed")
-            print(f"   Service: {data.get('service')}")
-            print(f"   Version: {data.get('version')}")
+            data = _loads(response.content)
+            out.append(f"   ✅ Health check passed")
+            out.append(f"   Service: {data.get('service')}")
+            out.append(f"   Version: {data.get('version')}")
         else:
-            print(f"   ❌ Health check failed: {response.status_code}")
+            out.append(f"   ❌ Health check failed: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        out.append(f"   ❌ Error: {e}")
     
     # Test 2: Root endpoint
-    print("\n2️⃣  Testing root endpoint...")
+    out.append("\n2️⃣  Testing root endpoint...")
     try:
         response = requests.get(f"{SERVICE_URL}/", timeout=5)
         if response.status_code == 200:
-            data = response.json()
-            print(f"   ✅ Root endpoint accessible")
-            print(f"   Service: {data.get('service')}")
-            print(f"   Endpoints: {', '.join(data.get('endpoints', {}).keys())}")
+            data = _loads(response.content)
+            out.append(f"   ✅ Root endpoint accessible")
+            out.append(f"   Service: {data.get('service')}")
+            out.append(f"   Endpoints: {', '.join(data.get('endpoints', _EMPTY))}")
         else:
-            print(f"   ❌ Failed: {response.status_code}")
+            out.append(f"   ❌ Failed: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        out.append(f"   ❌ Error: {e}")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def test_mcp_tools():
     """Test MCP tools via messages endpoint."""
-    print("\n" + "=" * 70)
-    print("Testing MCP Tools (Direct Messages)")
-    print("=" * 70)
+    out = []
+    out.append("\n" + _SEP70)
+    out.append("Testing MCP Tools (Direct Messages)")
+    out.append(_SEP70)
     
     client = CloudMCPClient(SERVICE_URL)
     
     # Test 3: List tools
-    print("\n3️⃣  Testing tools/list...")
+    out.append("\n3️⃣  Testing tools/list...")
     try:
         result = client.test_via_messages_post("tools/list", {})
         
         if "error" in result:
-            print(f"   ⚠️  Cannot access via direct POST: {result['error']}")
-            print(f"   ℹ️  This is expected - SSE transport requires active connection")
+            out.append(f"   ⚠️  Cannot access via direct POST: {result['error']}")
+            out.append(f"   ℹ️  This is expected - SSE transport requires active connection")
             return False
         elif "result" in result:
-            tools = result.get("result", {}).get("tools", [])
-            print(f"   ✅ Found {len(tools)} tools")
+            tools = result.get("result", _EMPTY).get("tools", ())
+            out.append(f"   ✅ Found {len(tools)} tools")
             for tool in tools[:5]:
-                print(f"      • {tool['name']}")
+                out.append(f"      • {tool['name']}")
             if len(tools) > 5:
-                print(f"      ... and {len(tools) - 5} more")
+                out.append(f"      ... and {len(tools) - 5} more")
             return True
         else:
-            print(f"   ❌ Unexpected response: {result}")
+            out.append(f"   ❌ Unexpected response: {result}")
             return False
     except Exception as e:
-        print(f"   ❌ Error: {e}")
+        out.append(f"   ❌ Error: {e}")
         return False
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 def test_via_curl_example():
     """Show curl example for testing."""
-    print("\n" + "=" * 70)
+    print("\n" + _SEP70)
     print("Alternative Testing Methods")
-    print("=" * 70)
+    print(_SEP70)
     
     print("\n4️⃣  Test with curl (SSE connection):")
     print(f'''
@@ -156,9 +186,9 @@ def test_via_curl_example():
 
 def show_integration_info():
     """Show how to integrate with various clients."""
-    print("\n" + "=" * 70)
+    print("\n" + _SEP70)
     print("Integration Options")
-    print("=" * 70)
+    print(_SEP70)
     
     print("\n✅ Free Options:")
     print("   1. MCP Inspector (npm package) - Free, no subscription needed")
@@ -210,9 +240,9 @@ def main():
     
     show_integration_info()
     
-    print("\n" + "=" * 70)
+    print("\n" + _SEP70)
     print("✅ Testing Complete")
-    print("=" * 70)
+    print(_SEP70)
     print("\n💡 Your server is deployed and healthy!")
     print(f"   URL: {SERVICE_URL}")
     print("\n🚀 Next Step: Install MCP Inspector for full testing")
@@ -4,107 +4,207 @@ Simple MCP client for testing the server.
 Tests the MCP server using stdio transport (the proper way).
 """
 
-import json
+import atexit
+import itertools
+import os
+import shutil
+import socket
 import subprocess
 import sys
-from typing import Any, Dict
+import time
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
+
+try:
+    import msgspec
+except ImportError:  # orjson writes the same JSON; requests become plain dicts
+    msgspec = None
+    import orjson
+
+_SEP60 = "=" * 60
+
+# Field accessors for the CTA / health score payloads (all required model fields)
+_cta = itemgetter("cta")
+_cta_summary = itemgetter("id", "title", "priority")
+_cta_progress = itemgetter("status", "updated_at")
+_health = itemgetter("health_score")
+_health_summary = itemgetter("account_id", "overall_score", "status")
 
 # Note: The /messages endpoint requires an SSE session, so we use stdio transport instead
 
 
+if msgspec is not None:
+    class _ToolCallParams(msgspec.Struct):
+        """Params for a tools/call request."""
+        name: str
+        arguments: Dict[str, Any]
+
+    _encode = msgspec.json.Encoder().encode
+    _decode = msgspec.json.Decoder().decode
+else:
+    def _ToolCallParams(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Params for a tools/call request."""
+        return {"name": name, "arguments": arguments}
+
+    _encode = orjson.dumps
+    _decode = orjson.loads
+
+# The JSON-RPC envelope is constant apart from id, method and params, so it is
+# spliced from pre-encoded bytes; only params go through the encoder per call
+_ENVELOPE_HEAD = b'{"jsonrpc":"2.0","id":'
+_method_fragments: Dict[str, bytes] = {}
+
+
+def _frame_request(request_id: int, method: str, params: Any) -> bytes:
+    """Encode one newline-terminated JSON-RPC request."""
+    fragment = _method_fragments.get(method)
+    if fragment is None:
+        fragment = _method_fragments[method] = b',"method":' + _encode(method) + b',"params":'
+    return b"".join((_ENVELOPE_HEAD, b"%d" % request_id, fragment, _encode(params), b"}\n"))
+
+
+# Socket of a running `python -m src.tests.mcp_daemon`, used instead of a fresh server
+DAEMON_SOCKET = os.environ.get("MCP_TEST_SOCKET", "/tmp/mcp-test.sock")
+
+
+def spawn_server() -> subprocess.Popen:
+    """Start the MCP server on stdio pipes."""
+    # An absolute executable path and close_fds=False let Popen use
+    # posix_spawn instead of fork+exec (our fds are non-inheritable anyway)
+    return subprocess.Popen(
+        [shutil.which("uv") or "uv", "run", "python", "-m", "src.server"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        # Nothing reads stderr; a full pipe would block the server's logging
+        stderr=subprocess.DEVNULL,
+        bufsize=0,
+        close_fds=False,
+    )
+
+
 class MCPStdioClient:
     """MCP client using stdio transport."""
     
-    def __init__(self):
-        """Start the MCP server process."""
-        self.process = subprocess.Popen(
-            ["uv", "run", "python", "-m", "src.server"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
-        self.request_id = 1
+    def __init__(self, socket_path: str = DAEMON_SOCKET):
+        """Connect to the test daemon if it is running, else start the MCP server process."""
+        self.process = None
+        self._sock = None
+        try:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            self._sock.close()
+            self._sock = None
+            self.process = spawn_server()
+        self._next_id = itertools.count(1).__next__
+        
+        # Talk to the pipes (or daemon socket) with os.read/os.write; requests
+        # are queued in _outgoing until flush() and partial reads accumulate in _incoming
+        if self._sock is not None:
+            self._wfd = self._rfd = self._sock.fileno()
+        else:
+            self._wfd = self.process.stdin.fileno()
+            self._rfd = self.process.stdout.fileno()
+        self._outgoing: List[bytes] = []
+        self._incoming = bytearray()
+        
+        # Responses read while waiting for a different request id
+        self._responses: Dict[int, Dict[str, Any]] = {}
         
         # Initialize the session
         self._initialize()
     
     def _initialize(self):
         """Initialize the MCP session."""
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": self.request_id,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {
-                    "name": "test-client",
-                    "version": "1.0.0"
-                }
+        request_id = self.send("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {
+                "name": "test-client",
+                "version": "1.0.0"
             }
-        }
-        self.request_id += 1
+        })
+        self.flush()
         
-        # Send initialization
-        self.process.stdin.write(json.dumps(init_request) + "\n")
-        self.process.stdin.flush()
-        
-        # Read response
-        response_line = self.process.stdout.readline()
-        if response_line:
-            response = json.loads(response_line)
-            if "result" in response:
-                print("✅ MCP session initialized")
-                return response
+        response = self.await_response(request_id)
+        if "result" in response:
+            print("✅ MCP session initialized")
+            return response
         return None
     
-    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Call an MCP tool."""
-        request = {
-            "jsonrpc": "2.0",
-            "id": self.request_id,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-        self.request_id += 1
+    def send(self, method: str, params: Any) -> int:
+        """
+        Queue a JSON-RPC request without waiting for its response.
         
-        # Send request
-        self.process.stdin.write(json.dumps(request) + "\n")
-        self.process.stdin.flush()
+        Call flush() once a batch is queued, then await_response() for each id.
         
-        # Read response
-        response_line = self.process.stdout.readline()
-        if response_line:
-            return json.loads(response_line)
-        return {"error": "No response"}
+        Returns:
+            The request id to pass to await_response()
+        """
+        request_id = self._next_id()
+        self._outgoing.append(_frame_request(request_id, method, params))
+        return request_id
+    
+    def flush(self):
+        """Push all queued requests to the server in as few writes as possible."""
+        data = memoryview(b"".join(self._outgoing))
+        self._outgoing.clear()
+        while data:
+            written = os.write(self._wfd, data)
+            data = data[written:]
+    
+    def _read_line(self) -> bytes:
+        """Return the next newline-terminated message, or b"" at EOF."""
+        while True:
+            end = self._incoming.find(b"\n")
+            if end >= 0:
+                line = bytes(self._incoming[:end])
+                del self._incoming[:end + 1]
+                return line
+            chunk = os.read(self._rfd, 65536)
+            if not chunk:
+                return b""
+            self._incoming += chunk
+    
+    def await_response(self, request_id: int) -> Dict[str, Any]:
+        """Read responses until the one for request_id arrives, keeping the others."""
+        while request_id not in self._responses:
+            response_line = self._read_line()
+            if not response_line:
+                return {"error": "No response"}
+            message = _decode(response_line)
+            # Skip server notifications/requests; only responses carry our ids
+            if "id" in message and "method" not in message:
+                self._responses[message["id"]] = message
+        return self._responses.pop(request_id)
+    
+    def send_tool(self, tool_name: str, arguments: Dict[str, Any]) -> int:
+        """Queue an MCP tool call and return its request id."""
+        return self.send("tools/call", _ToolCallParams(tool_name, arguments))
+    
+    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call an MCP tool."""
+        request_id = self.send_tool(tool_name, arguments)
+        self.flush()
+        return self.await_response(request_id)
     
     def list_tools(self) -> Dict[str, Any]:
         """List available tools."""
-        request = {
-            "jsonrpc": "2.0",
-            "id": self.request_id,
-            "method": "tools/list",
-            "params": {}
-        }
-        self.request_id += 1
-        
-        # Send request
-        self.process.stdin.write(json.dumps(request) + "\n")
-        self.process.stdin.flush()
-        
-        # Read response
-        response_line = self.process.stdout.readline()
-        if response_line:
-            return json.loads(response_line)
-        return {"error": "No response"}
+        request_id = self.send("tools/list", {})
+        self.flush()
+        return self.await_response(request_id)
+    
+    def is_alive(self) -> bool:
+        """Whether the connection to the server is still usable."""
+        if self._sock is not None:
+            return self._sock.fileno() != -1
+        return self.process.poll() is None
     
     def close(self):
-        """Close the MCP session."""
+        """Close the MCP session (the daemon's server keeps running)."""
+        if self._sock is not None:
+            self._sock.close()
+            return
         try:
             self.process.stdin.close()
             self.process.terminate()
@@ -113,276 +213,240 @@ class MCPStdioClient:
             self.process.kill()
 
 
+_shared_client = None
+
+
+def get_client() -> MCPStdioClient:
+    """Return the shared MCP client, starting the server on first use."""
+    global _shared_client
+    if _shared_client is None or not _shared_client.is_alive():
+        _shared_client = MCPStdioClient()
+        atexit.register(_shared_client.close)
+    return _shared_client
+
+
+def _unwrap(result: Dict[str, Any]) -> Tuple[bool, Any]:
+    """
+    Extract a tool's structured payload from a tools/call response.
+    
+    Returns:
+        (True, structuredContent) if the tool succeeded, otherwise
+        (False, a printable status line describing the failure)
+    """
+    tool_result = result.get("result")
+    if tool_result is None:
+        return False, f"❌ Error: {result.get('error', 'Unknown error')}"
+    # FastMCP returns structured content
+    data = tool_result.get("structuredContent")
+    if data is None:
+        return False, "❌ Unexpected response format"
+    if not data.get("success"):
+        return False, f"⚠️  {data.get('error', 'Unknown')}"
+    return True, data
+
+
 def test_mcp_tools():
     """Test MCP tools via stdio transport."""
-    print("=" * 60)
-    print("Testing MCP Server (stdio transport)")
-    print("=" * 60)
+    # Collect the report and emit it in one write instead of a print() per line
+    out = []
+    out.append(_SEP60)
+    out.append("Testing MCP Server (stdio transport)")
+    out.append(_SEP60)
+    
+    # Reuse the server process across test runs in this session
+    client = get_client()
     
-    client = MCPStdioClient()
+    # Queue every call without a data dependency up front, then drain the
+    # responses by id. Only 6 (needs the new CTA id) and 8 (reads the score
+    # written by 7) wait for an earlier result.
+    username = f"test_user_{int(time.time())}"
+    pending = {
+        "list_tools": client.send("tools/list", {}),
+        "authenticate": client.send_tool("authenticate", {
+            "username": "admin",
+            "password": "admin123"
+        }),
+        "register_user": client.send_tool("register_user", {
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "TestPassword123!",
+            "full_name": "Test User"
+        }),
+        "list_call_to_actions": client.send_tool("list_call_to_actions", {}),
+        "create_call_to_action": client.send_tool("create_call_to_action", {
+            "account_id": "acct-test-001",
+            "title": f"Test CTA {int(time.time())}",
+            "description": "This is a test CTA created by the test client",
+            "priority": "high",
+            "owner": "test@example.com",
+            "due_date_days": 7,
+            "tags": ["test", "automated"]
+        }),
+        "update_health_score": client.send_tool("update_health_score", {
+            "account_id": "acct-test-001",
+            "overall_score": 85.5,
+            "product_usage": 90.0,
+            "support_satisfaction": 88.0,
+            "engagement": 78.0,
+            "renewal_likelihood": 85.0
+        }),
+        "list_health_scores": client.send_tool("list_health_scores", {}),
+    }
+    client.flush()
     
+    # Test 1: List available tools
+    out.append("\n1️⃣  Listing available tools...")
     try:
-        # Test 1: List available tools
-        print("\n1️⃣  Listing available tools...")
-        try:
-            result = client.list_tools()
-            if "result" in result and "tools" in result["result"]:
-                tools = result["result"]["tools"]
-                print(f"   ✅ Found {len(tools)} tools")
-                print("\n   Available tools:")
-                for tool in tools[:8]:  # Show first 8
-                    desc = tool.get('description', 'No description')
-                    # Truncate description
-                    if len(desc) > 60:
-                        desc = desc[:57] + "..."
-                    print(f"     • {tool['name']}: {desc}")
-                if len(tools) > 8:
-                    print(f"     ... and {len(tools) - 8} more")
-            else:
-                print(f"   ❌ Unexpected response: {result}")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
-        # Test 2: Authenticate
-        print("\n2️⃣  Testing authentication...")
-        try:
-            result = client.call_tool("authenticate", {
-                "username": "admin",
-                "password": "admin123"
-            })
-            
-            if "result" in result:
-                tool_result = result["result"]
-                # FastMCP returns structured content
-                if "structuredContent" in tool_result:
-                    response_data = tool_result["structuredContent"]
-                    if response_data.get("success"):
-                        print(f"   ✅ Authentication successful!")
-                        print(f"   User: {response_data['user']['username']}")
-                        print(f"   Scopes: {', '.join(response_data['user']['scopes'])}")
-                        print(f"   Token expires in: {response_data['expires_in']} seconds")
-                    else:
-                        print(f"   ❌ Authentication failed: {response_data.get('error')}")
-                else:
-                    print(f"   ❌ Unexpected response format")
-            else:
-                print(f"   ❌ Error: {result.get('error', 'Unknown error')}")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
-        # Test 3: Register user (will fail without database, but tests the tool)
-        print("\n3️⃣  Testing user registration...")
-        try:
-            import time
-            username = f"test_user_{int(time.time())}"
-            result = client.call_tool("register_user", {
-                "username": username,
-                "email": f"{username}@example.com",
-                "password": "TestPassword123!",
-                "full_name": "Test User"
-            })
-            
-            if "result" in result:
-                tool_result = result["result"]
-                if "structuredContent" in tool_result:
-                    response_data = tool_result["structuredContent"]
-                    if response_data.get("success"):
-                        print(f"   ✅ Registration successful!")
-                        print(f"   Username: {response_data['username']}")
-                        print(f"   Email: {response_data['email']}")
-                    else:
-                        error = response_data.get('error', 'Unknown')
-                        if 'Database' in error or 'database' in error:
-                            print(f"   ⚠️  Database not configured (expected for local testing)")
-                            print(f"   ℹ️  Tool is working correctly, needs PostgreSQL")
-                        else:
-                            print(f"   ⚠️  {error}")
-                else:
-                    print(f"   ❌ Unexpected response format")
-            else:
-                print(f"   ❌ Error: {result.get('error', 'Unknown error')}")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
-        # Test 4: List CTAs
-        print("\n4️⃣  Testing list_call_to_actions...")
-        try:
-            result = client.call_tool("list_call_to_actions", {})
-            
-            if "result" in result:
-                tool_result = result["result"]
-                if "structuredContent" in tool_result:
-                    response_data = tool_result["structuredContent"]
-                    if response_data.get("success"):
-                        count = response_data.get('count', 0)
-                        print(f"   ✅ Found {count} CTA(s)")
-                        if count > 0:
-                            ctas = response_data.get('ctas', [])
-                            for cta in ctas[:3]:  # Show first 3
-                                print(f"      • {cta['title']} (Priority: {cta['priority']})")
-                    else:
-                        print(f"   ⚠️  {response_data.get('error', 'Unknown')}")
-                else:
-                    print(f"   ❌ Unexpected response format")
-            else:
-                print(f"   ❌ Error: {result.get('error', 'Unknown error')}")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
-        # Test 5: Create a new CTA
-        print("\n5️⃣  Testing create_call_to_action...")
-        try:
-            import time
-            result = client.call_tool("create_call_to_action", {
-                "account_id": "acct-test-001",
-                "title": f"Test CTA {int(time.time())}",
-                "description": "This is a test CTA created by the test client",
-                "priority": "high",
-                "owner": "test@example.com",
-                "due_date_days": 7,
-                "tags": ["test", "automated"]
-            })
-            
-            if "result" in result:
-                tool_result = result["result"]
-                if "structuredContent" in tool_result:
-                    response_data = tool_result["structuredContent"]
-                    if response_data.get("success"):
-                        cta = response_data.get('cta', {})
-                        print(f"   ✅ CTA created successfully!")
-                        print(f"   ID: {cta.get('id')}")
-                        print(f"   Title: {cta.get('title')}")
-                        print(f"   Priority: {cta.get('priority')}")
-                        cta_id = cta.get('id')  # Save for update test
-                    else:
-                        print(f"   ⚠️  {response_data.get('error', 'Unknown')}")
-                        cta_id = None
-                else:
-                    print(f"   ❌ Unexpected response format")
-                    cta_id = None
-            else:
-                print(f"   ❌ Error: {result.get('error', 'Unknown error')}")
-                cta_id = None
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            cta_id = None
-        
-        # Test 6: Update the CTA we just created
-        if cta_id:
-            print("\n6️⃣  Testing update_call_to_action...")
-            try:
-                result = client.call_tool("update_call_to_action", {
-                    "cta_id": cta_id,
-                    "status": "in_progress",
-                    "notes": "Updated by test client"
-                })
-                
-                if "result" in result:
-                    tool_result = result["result"]
-                    if "structuredContent" in tool_result:
-                        response_data = tool_result["structuredContent"]
-                        if response_data.get("success"):
-                            cta = response_data.get('cta', {})
-                            print(f"   ✅ CTA updated successfully!")
-                            print(f"   Status: {cta.get('status')}")
-                            print(f"   Updated: {cta.get('updated_at')}")
-                        else:
-                            print(f"   ⚠️  {response_data.get('error', 'Unknown')}")
-                    else:
-                        print(f"   ❌ Unexpected response format")
-                else:
-                    print(f"   ❌ Error: {result.get('error', 'Unknown error')}")
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
+        result = client.await_response(pending["list_tools"])
+        if "result" in result and "tools" in result["result"]:
+            tools = result["result"]["tools"]
+            out.append(f"   ✅ Found {len(tools)} tools")
+            out.append("\n   Available tools:")
+            for tool in tools[:8]:  # Show first 8
+                desc = tool.get('description', 'No description')
+                # Truncate description
+                if len(desc) > 60:
+                    desc = desc[:57] + "..."
+                out.append(f"     • {tool['name']}: {desc}")
+            if len(tools) > 8:
+                out.append(f"     ... and {len(tools) - 8} more")
         else:
-            print("\n6️⃣  Skipping update_call_to_action (no CTA ID)")
-        
-        # Test 7: Create/Update a health score
-        print("\n7️⃣  Testing update_health_score...")
-        try:
-            result = client.call_tool("update_health_score", {
-                "account_id": "acct-test-001",
-                "overall_score": 85.5,
-                "product_usage": 90.0,
-                "support_satisfaction": 88.0,
-                "engagement": 78.0,
-                "renewal_likelihood": 85.0
-            })
-            
-            if "result" in result:
-                tool_result = result["result"]
-                if "structuredContent" in tool_result:
-                    response_data = tool_result["structuredContent"]
-                    if response_data.get("success"):
-                        health = response_data.get('health_score', {})
-                        print(f"   ✅ Health score created/updated!")
-                        print(f"   Account: {health.get('account_id')}")
-                        print(f"   Overall Score: {health.get('overall_score')}")
-                        print(f"   Status: {health.get('status')}")
-                    else:
-                        print(f"   ⚠️  {response_data.get('error', 'Unknown')}")
-                else:
-                    print(f"   ❌ Unexpected response format")
-            else:
-                print(f"   ❌ Error: {result.get('error', 'Unknown error')}")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
-        # Test 8: Get the health score we just created
-        print("\n8️⃣  Testing get_health_score...")
-        try:
-            result = client.call_tool("get_health_score", {
-                "account_id": "acct-test-001"
-            })
-            
-            if "result" in result:
-                tool_result = result["result"]
-                if "structuredContent" in tool_result:
-                    response_data = tool_result["structuredContent"]
-                    if response_data.get("success"):
-                        health = response_data.get('health_score', {})
-                        print(f"   ✅ Health score retrieved!")
-                        print(f"   Account: {health.get('account_id')}")
-                        print(f"   Overall Score: {health.get('overall_score')}")
-                        print(f"   Product Usage: {health.get('product_usage')}")
-                        print(f"   Engagement: {health.get('engagement')}")
-                        print(f"   Status: {health.get('status')}")
-                    else:
-                        print(f"   ⚠️  {response_data.get('error', 'Unknown')}")
-                else:
-                    print(f"   ❌ Unexpected response format")
-            else:
-                print(f"   ❌ Error: {result.get('error', 'Unknown error')}")
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-        
-        # Test 9: List all health scores
-        print("\n9️⃣  Testing list_health_scores...")
+            out.append(f"   ❌ Unexpected response: {result}")
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
+    
+    # Test 2: Authenticate
+    out.append("\n2️⃣  Testing authentication...")
+    try:
+        ok, data = _unwrap(client.await_response(pending["authenticate"]))
+        if ok:
+            out.append(f"   ✅ Authentication successful!")
+            out.append(f"   User: {data['user']['username']}")
+            out.append(f"   Scopes: {', '.join(data['user']['scopes'])}")
+            out.append(f"   Token expires in: {data['expires_in']} seconds")
+        else:
+            out.append(f"   {data}")
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
+    
+    # Test 3: Register user (will fail without database, but tests the tool)
+    out.append("\n3️⃣  Testing user registration...")
+    try:
+        ok, data = _unwrap(client.await_response(pending["register_user"]))
+        if ok:
+            out.append(f"   ✅ Registration successful!")
+            out.append(f"   Username: {data['username']}")
+            out.append(f"   Email: {data['email']}")
+        elif 'Database' in data or 'database' in data:
+            out.append(f"   ⚠️  Database not configured (expected for local testing)")
+            out.append(f"   ℹ️  Tool is working correctly, needs PostgreSQL")
+        else:
+            out.append(f"   {data}")
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
+    
+    # Test 4: List CTAs
+    out.append("\n4️⃣  Testing list_call_to_actions...")
+    try:
+        ok, data = _unwrap(client.await_response(pending["list_call_to_actions"]))
+        if ok:
+            count = data.get('count', 0)
+            out.append(f"   ✅ Found {count} CTA(s)")
+            for cta in data.get('ctas', ())[:3]:  # Show first 3
+                out.append(f"      • {cta['title']} (Priority: {cta['priority']})")
+        else:
+            out.append(f"   {data}")
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
+    
+    # Test 5: Create a new CTA
+    out.append("\n5️⃣  Testing create_call_to_action...")
+    cta_id = None
+    try:
+        ok, data = _unwrap(client.await_response(pending["create_call_to_action"]))
+        if ok:
+            cta_id, title, priority = _cta_summary(_cta(data))  # Save id for update test
+            out.append(f"   ✅ CTA created successfully!")
+            out.append(f"   ID: {cta_id}")
+            out.append(f"   Title: {title}")
+            out.append(f"   Priority: {priority}")
+        else:
+            out.append(f"   {data}")
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
+    
+    # Test 6: Update the CTA we just created
+    if cta_id:
+        out.append("\n6️⃣  Testing update_call_to_action...")
         try:
-            result = client.call_tool("list_health_scores", {})
-            
-            if "result" in result:
-                tool_result = result["result"]
-                if "structuredContent" in tool_result:
-                    response_data = tool_result["structuredContent"]
-                    if response_data.get("success"):
-                        count = response_data.get('count', 0)
-                        print(f"   ✅ Found {count} health score(s)")
-                        if count > 0:
-                            scores = response_data.get('health_scores', [])
-                            for score in scores[:5]:  # Show first 5
-                                print(f"      • {score['account_id']}: {score['overall_score']} ({score['status']})")
-                    else:
-                        print(f"   ⚠️  {response_data.get('error', 'Unknown')}")
-                else:
-                    print(f"   ❌ Unexpected response format")
+            ok, data = _unwrap(client.call_tool("update_call_to_action", {
+                "cta_id": cta_id,
+                "status": "in_progress",
+                "notes": "Updated by test client"
+            }))
+            if ok:
+                status, updated_at = _cta_progress(_cta(data))
+                out.append(f"   ✅ CTA updated successfully!")
+                out.append(f"   Status: {status}")
+                out.append(f"   Updated: {updated_at}")
             else:
-                print(f"   ❌ Error: {result.get('error', 'Unknown error')}")
+                out.append(f"   {data}")
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            out.append(f"   ❌ Error: {e}")
+    else:
+        out.append("\n6️⃣  Skipping update_call_to_action (no CTA ID)")
+    
+    # Test 7: Create/Update a health score
+    out.append("\n7️⃣  Testing update_health_score...")
+    try:
+        ok, data = _unwrap(client.await_response(pending["update_health_score"]))
+        if ok:
+            account_id, overall_score, status = _health_summary(_health(data))
+            out.append(f"   ✅ Health score created/updated!")
+            out.append(f"   Account: {account_id}")
+            out.append(f"   Overall Score: {overall_score}")
+            out.append(f"   Status: {status}")
+        else:
+            out.append(f"   {data}")
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
+    
+    # Test 8: Get the health score we just created
+    out.append("\n8️⃣  Testing get_health_score...")
+    try:
+        ok, data = _unwrap(client.call_tool("get_health_score", {
+            "account_id": "acct-test-001"
+        }))
+        if ok:
+            health = _health(data)
+            account_id, overall_score, status = _health_summary(health)
+            out.append(f"   ✅ Health score retrieved!")
+            out.append(f"   Account: {account_id}")
+            out.append(f"   Overall Score: {overall_score}")
+            # Not HealthScore fields; shown only if the server adds them
+            out.append(f"   Product Usage: {health.get('product_usage')}")
+            out.append(f"   Engagement: {health.get('engagement')}")
+            out.append(f"   Status: {status}")
+        else:
+            out.append(f"   {data}")
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
+    
+    # Test 9: List all health scores
+    out.append("\n9️⃣  Testing list_health_scores...")
+    try:
+        ok, data = _unwrap(client.await_response(pending["list_health_scores"]))
+        if ok:
+            count = data.get('count', 0)
+            out.append(f"   ✅ Found {count} health score(s)")
+            for score in data.get('health_scores', ())[:5]:  # Show first 5
+                out.append(f"      • {score['account_id']}: {score['overall_score']} ({score['status']})")
+        else:
+            out.append(f"   {data}")
+    except Exception as e:
+        out.append(f"   ❌ Error: {e}")
     
-    finally:
-        client.close()
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -392,11 +456,12 @@ if __name__ == "__main__":
     # Run tests
     test_mcp_tools()
     
-    print("\n" + "=" * 60)
+    print("\n" + _SEP60)
     print("✅ Testing complete!")
-    print("=" * 60)
+    print(_SEP60)
     print("\n💡 Tips:")
     print("  • This test uses stdio transport (local testing)")
+    print("  • Run `python -m src.tests.mcp_daemon` to keep the server hot between runs")
     print("  • For SSE/HTTP testing, use Claude Desktop or MCP Inspector")
     print("  • See README.md for Claude Desktop configuration")
     print()
@@ -0,0 +1,114 @@
+"""Tests for user service helpers that don't need a database."""
+
+import secrets
+from datetime import datetime, timedelta
+from unittest import mock
+
+import bcrypt
+from argon2 import PasswordHasher
+
+from src.user_service import (
+    UserService,
+    check_password,
+    password_needs_rehash,
+    _parse_verification_token,
+    _utc_epoch,
+    _verification_mac,
+)
+
+
+def test_argon2_password_verifies():
+    """New passwords hash with argon2id and verify against the right password only."""
+    hashed = UserService().hash_password("correct horse")
+    assert hashed.startswith("$argon2id$")
+    assert check_password("correct horse", hashed)
+    assert not check_password("battery staple", hashed)
+    assert not password_needs_rehash(hashed)
+
+
+def test_bcrypt_password_verifies_and_needs_rehash():
+    """Legacy bcrypt hashes still verify but are flagged for rehashing."""
+    hashed = bcrypt.hashpw(b"correct horse", bcrypt.gensalt(rounds=4)).decode()
+    assert check_password("correct horse", hashed)
+    assert not check_password("battery staple", hashed)
+    assert password_needs_rehash(hashed)
+
+
+def test_outdated_argon2_params_need_rehash():
+    """Argon2 hashes made with weaker parameters are flagged for rehashing."""
+    weak = PasswordHasher(time_cost=1, memory_cost=8 * 1024, parallelism=1)
+    hashed = weak.hash("correct horse")
+    assert check_password("correct horse", hashed)
+    assert password_needs_rehash(hashed)
+
+
+def test_corrupt_argon2_hash_returns_false():
+    """A damaged argon2 hash fails verification instead of raising."""
+    hashed = UserService().hash_password("correct horse")
+    assert not check_password("correct horse", hashed[:-10])
+    assert not check_password("correct horse", "$argon2id$not-a-hash")
+
+
+def _signed_token(user_id: int = 42) -> tuple[str, int]:
+    """Return a fresh signed verification token and its expiry epoch."""
+    expires_at = datetime.utcnow().replace(microsecond=0) + timedelta(hours=24)
+    return UserService().generate_verification_token(user_id, expires_at), _utc_epoch(expires_at)
+
+
+def test_verification_token_round_trip():
+    """A generated token parses back to its user id and expiry."""
+    token, expires_epoch = _signed_token(42)
+    assert token == f"42.{expires_epoch}.{_verification_mac(42, expires_epoch)}"
+    assert _parse_verification_token(token) == (42, expires_epoch)
+
+
+def test_verification_token_tampering_rejected():
+    """Changing the MAC, the user id or the expiry invalidates the token."""
+    token, expires_epoch = _signed_token(42)
+    user_id, expiry, mac = token.split(".")
+    flipped = ("A" if mac[0] != "A" else "B") + mac[1:]
+
+    assert _parse_verification_token(f"{user_id}.{expiry}.{flipped}") is None
+    assert _parse_verification_token(f"{user_id}.{expiry}.{mac[:-1]}") is None
+    assert _parse_verification_token(f"43.{expiry}.{mac}") is None
+    assert _parse_verification_token(f"{user_id}.{expires_epoch + 86400}.{mac}") is None
+
+
+def test_verification_token_malformed_rejected():
+    """Wrong part counts and non-decimal fields don't parse."""
+    token, expires_epoch = _signed_token(42)
+    mac = _verification_mac(42, expires_epoch)
+    for malformed in (
+        "",
+        "42",
+        f"42.{expires_epoch}",
+        f"{token}.extra",
+        f"-42.{expires_epoch}.{mac}",
+        f"+42.{expires_epoch}.{mac}",
+        f"42.{expires_epoch}.5.{mac}",
+        f"0x2a.{expires_epoch}.{mac}",
+        f"42.{expires_epoch}e0.{mac}",
+        f" 42.{expires_epoch}.{mac}",
+        f"42..{mac}",
+        f"42.{expires_epoch}.{mac}é",
+    ):
+        assert _parse_verification_token(malformed) is None, malformed
+
+
+def test_legacy_token_uses_stored_token_lookup():
+    """Opaque tokens issued before signing fall through to the stored-token path."""
+    legacy = secrets.token_urlsafe(32)
+    assert _parse_verification_token(legacy) is None
+
+    service = UserService()
+    service.db = mock.Mock()
+    service.db.execute_query.return_value = {
+        "success": True,
+        "results": [{"id": 7, "username": "legacy", "email": "legacy@example.com"}],
+    }
+    result = service.verify_email(legacy)
+
+    assert result["success"]
+    args, kwargs = service.db.execute_query.call_args
+    assert args[1] == (legacy,)
+    assert kwargs["statement_name"] == "user_service_verify_stored_token"
@@ -1,42 +1,206 @@
 """User management service for registration and verification."""
 
+import base64
+import hashlib
+import hmac
+import os
+import re
 import secrets
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Optional, Dict, Any, Iterator
 import bcrypt
-from src.db_service import DatabaseService
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from src.db_service import db_service
 from src.email_service import email_service
 from src.config import settings
 
 
+# New hashes are argon2id; bcrypt hashes from earlier releases still verify and
+# are rehashed on the owner's next successful login
+_password_hasher = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=4)
+
+# Checked against when no user matches, so misses cost as much as hits. Built
+# at import so the first miss doesn't also pay for hashing it.
+_DUMMY_PASSWORD_HASH = _password_hasher.hash(secrets.token_urlsafe(16))
+
+# Runs background rehashes after login; argon2 and bcrypt release the GIL while hashing
+_hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="password-hash")
+
+# Input validation; emails are stored lowercased so lookups match LOWER(email)
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_USERNAME_RE = re.compile(r"[A-Za-z0-9_.-]{3,100}")
+
+# register_user responses
+_MSG_REGISTERED_EMAIL_QUEUED = (
+    "Registration successful! Verification email on its way — check your inbox."
+)
+_MSG_REGISTERED_NO_EMAIL = (
+    "Registration successful! No verification email sent (email provider not configured)."
+)
+
+# Verification emails go out in the background so SMTP/SES latency stays off
+# the registration path
+_email_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="verification-email")
+
+# Verification tokens are "<user_id>.<expires_epoch>.<mac>"; the MAC is keyed
+# on the app secret and bound to the expiry stored for the user, so issuing a
+# new token or verifying the email invalidates older ones
+_VERIFICATION_TOKEN_TTL = timedelta(hours=24)
+_VERIFICATION_TOKEN_KEY = hashlib.sha256(
+    b"email-verification:" + settings.jwt_secret_key.encode("utf-8")
+).digest()
+
+# get_user_by_username cache: username -> (cached_at, user). Module-level so the
+# per-request UserService instances created by auth share it.
+_USER_CACHE_TTL = 5.0               # seconds — bounds staleness after external writes
+_USER_CACHE_MAX_ENTRIES = 10_000
+_user_cache: dict[str, tuple[float, Dict[str, Any]]] = {}
+# Lookups arrive from threadpool workers; guards eviction's check-then-insert
+_user_cache_lock = threading.Lock()
+
+# Columns selected by iter_users, unpacked per row in one C-level call
+_list_user_row = itemgetter(
+    "id", "username", "email", "full_name", "disabled", "scopes", "email_verified", "created_at"
+)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against an argon2id or legacy bcrypt hash."""
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return bcrypt.checkpw(
+        plain_password.encode('utf-8'),
+        hashed_password.encode('utf-8')
+    )
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True for bcrypt hashes and argon2 hashes with outdated parameters."""
+    if hashed_password.startswith("$argon2"):
+        return _password_hasher.check_needs_rehash(hashed_password)
+    return True
+
+
+def _user_cache_get(username: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of the cached user if it is still fresh."""
+    with _user_cache_lock:
+        entry = _user_cache.get(username)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > _USER_CACHE_TTL:
+            del _user_cache[username]
+            return None
+    return dict(entry[1])
+
+
+def _user_cache_set(username: str, user: Dict[str, Any]) -> None:
+    """Cache a user, evicting the oldest entry when full."""
+    entry = (time.monotonic(), dict(user))
+    with _user_cache_lock:
+        if username not in _user_cache and len(_user_cache) >= _USER_CACHE_MAX_ENTRIES:
+            del _user_cache[next(iter(_user_cache))]
+        _user_cache[username] = entry
+
+
+def _user_cache_discard(username: str) -> None:
+    """Drop a user's cached entry after a write."""
+    with _user_cache_lock:
+        _user_cache.pop(username, None)
+
+
+def _utc_epoch(value: datetime) -> int:
+    """Seconds since the epoch for a naive UTC datetime."""
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _verification_mac(user_id: int, expires_epoch: int) -> str:
+    """Truncated HMAC-SHA256 over the token's user id and expiry."""
+    digest = hmac.new(
+        _VERIFICATION_TOKEN_KEY, f"{user_id}:{expires_epoch}".encode(), hashlib.sha256
+    ).digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b"=").decode()
+
+
+def _parse_verification_token(token: str) -> Optional[tuple[int, int]]:
+    """Return (user_id, expires_epoch) if the token's MAC checks out."""
+    parts = token.split(".")
+    if len(parts) != 3 or not parts[0].isdecimal() or not parts[1].isdecimal():
+        return None
+    user_id, expires_epoch = int(parts[0]), int(parts[1])
+    expected = _verification_mac(user_id, expires_epoch).encode()
+    if not hmac.compare_digest(parts[2].encode("utf-8", "replace"), expected):
+        return None
+    return user_id, expires_epoch
+
+
+def _log_email_failure(future) -> None:
+    """Log a verification email that raised instead of returning a status."""
+    error = future.exception()
+    if error is not None:
+        print(f"Warning: Failed to send verification email: {error}")
+
+
 class UserService:
     """Service for managing user registration and authentication."""
     
     def __init__(self):
         """Initialize the user service."""
-        self.db = DatabaseService()
+        # Shared instance, so every service reuses one connection pool
+        self.db = db_service
     
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt."""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        """Hash a password using argon2id."""
+        return _password_hasher.hash(password)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash."""
-        return bcrypt.checkpw(
-            plain_password.encode('utf-8'),
-            hashed_password.encode('utf-8')
-        )
+        """Verify a password against its argon2id or legacy bcrypt hash."""
+        return check_password(plain_password, hashed_password)
+    
+    def rehash_password(self, username: str, password: str, old_hash: str) -> None:
+        """Replace a user's stored hash with a fresh argon2id hash of their password.
+        
+        Only applies while the stored hash is still old_hash (the one the password
+        was verified against), so a password changed in the meantime is kept.
+        """
+        try:
+            self.db.execute_query(
+                """
+                    UPDATE users
+                    SET hashed_password = %(hashed_password)s
+                    WHERE username = %(username)s
+                      AND hashed_password = %(old_hash)s
+                """,
+                {
+                    "username": username,
+                    "hashed_password": self.hash_password(password),
+                    "old_hash": old_hash,
+                },
+                fetch_results=False,
+            )
+            _user_cache_discard(username)
+        except Exception as e:
+            print(f"Warning: Failed to rehash password for {username}: {e}")
+    
+    def schedule_password_rehash(self, username: str, password: str, old_hash: str) -> None:
+        """Rehash a just-verified password in the background so login isn't delayed."""
+        _hash_pool.submit(self.rehash_password, username, password, old_hash)
     
     def verify_admin(self, email: str, password: str) -> Dict[str, Any]:
         """
         Verify if a user is an admin by email and password.
         
         Checks the Cloud SQL database (customer_success.public.users) for:
-        - Email exists
-        - Password matches hashed_password
+        - Email exists and password matches hashed_password (reported together
+          as "Invalid email or password")
         - admin column is True
         
         Args:
@@ -51,15 +215,21 @@ class UserService:
             query = """
                 SELECT email, hashed_password, scopes, username, full_name
                 FROM users
-                WHERE email = %(email)s
+                WHERE LOWER(email) = LOWER($1::text)
             """
             
-            result = self.db.execute_query(query, {"email": email})
+            result = self.db.execute_query(
+                query, (email.strip().lower(),), statement_name="user_service_admin_by_email"
+            )
             
+            # Unknown emails still pay for a hash check and get the same error
+            # as a wrong password, so neither timing nor message reveals
+            # which accounts exist
             if not result or not result.get("results"):
+                self.verify_password(password, _DUMMY_PASSWORD_HASH)
                 return {
                     "success": False,
-                    "error": "Email not found in the system"
+                    "error": "Invalid email or password"
                 }
             
             user = result["results"][0]
@@ -68,8 +238,12 @@ class UserService:
             if not self.verify_password(password, user['hashed_password']):
                 return {
                     "success": False,
-                    "error": "Invalid password"
+                    "error": "Invalid email or password"
                 }
+            if password_needs_rehash(user['hashed_password']):
+                self.schedule_password_rehash(
+                    user['username'], password, user['hashed_password']
+                )
             
             # Check if user has admin scope
             user_scopes = user.get('scopes', [])
@@ -93,9 +267,10 @@ class UserService:
                 "error": f"Admin verification failed: {str(e)}"
             }
     
-    def generate_verification_token(self) -> str:
-        """Generate a secure verification token."""
-        return secrets.token_urlsafe(32)
+    def generate_verification_token(self, user_id: int, expires_at: datetime) -> str:
+        """Generate a signed verification token for a user and expiry (naive UTC)."""
+        expires_epoch = _utc_epoch(expires_at)
+        return f"{user_id}.{expires_epoch}.{_verification_mac(user_id, expires_epoch)}"
     
     def register_user(
         self,
@@ -124,53 +299,51 @@ class UserService:
             Exception if username or email already exists
         """
         # Validate input
-        if len(username) < 3:
-            raise ValueError("Username must be at least 3 characters")
+        if not _USERNAME_RE.fullmatch(username):
+            raise ValueError(
+                "Username must be 3-100 characters of letters, digits, '.', '_' or '-'"
+            )
         if len(password) < 8:
             raise ValueError("Password must be at least 8 characters")
-        if '@' not in email:
+        email = email.strip().lower()
+        if not _EMAIL_RE.fullmatch(email):
             raise ValueError("Invalid email address")
         
-        # Check if username or email exists
-        check_query = """
-            SELECT username, email FROM users 
-            WHERE username = %(username)s OR email = %(email)s
-        """
-        existing = self.db.execute_query(
-            check_query,
-            {"username": username, "email": email}
-        )
-        
-        if existing and existing.get("results"):
-            if existing["results"][0]['username'] == username:
-                raise ValueError(f"Username '{username}' is already taken")
-            if existing["results"][0]['email'] == email:
-                raise ValueError(f"Email '{email}' is already registered")
-        
         # Hash password
         hashed_password = self.hash_password(password)
         
-        # Generate verification token
-        verification_token = self.generate_verification_token()
-        token_expires = datetime.utcnow() + timedelta(hours=24)
+        # Token expiry (whole seconds, since the token carries it as an epoch)
+        token_expires = (datetime.utcnow() + _VERIFICATION_TOKEN_TTL).replace(microsecond=0)
         
         # Build scopes
         scopes = ['read', 'write']
         if admin:
             scopes.append('admin')
         
-        # Insert user
+        # Check for an existing username/email and insert in one round trip.
+        # Conflicting rows come back with status 'conflict'; ON CONFLICT covers
+        # a concurrent registration that lands between the check and the insert.
         insert_query = """
-            INSERT INTO users (
-                username, email, full_name, hashed_password, 
-                verification_token, verification_token_expires,
-                email_verified, scopes
-            ) VALUES (
-                %(username)s, %(email)s, %(full_name)s, %(hashed_password)s,
-                %(verification_token)s, %(verification_token_expires)s,
-                false, %(scopes)s
+            WITH existing AS (
+                SELECT username, email FROM users
+                WHERE username = %(username)s OR LOWER(email) = LOWER(%(email)s)
+            ), inserted AS (
+                INSERT INTO users (
+                    username, email, full_name, hashed_password, 
+                    verification_token_expires, email_verified, scopes
+                )
+                SELECT
+                    %(username)s, %(email)s, %(full_name)s, %(hashed_password)s,
+                    %(verification_token_expires)s, false, %(scopes)s
+                WHERE NOT EXISTS (SELECT 1 FROM existing)
+                ON CONFLICT DO NOTHING
+                RETURNING id, username, email, full_name, scopes, created_at
             )
-            RETURNING id, username, email, full_name, scopes, created_at
+            SELECT 'inserted' AS status, id, username, email, full_name, scopes, created_at
+            FROM inserted
+            UNION ALL
+            SELECT 'conflict', NULL, username, email, NULL, NULL, NULL
+            FROM existing
         """
         
         result = self.db.execute_query(
@@ -180,28 +353,35 @@ class UserService:
                 "email": email,
                 "full_name": full_name or username,
                 "hashed_password": hashed_password,
-                "verification_token": verification_token,
                 "verification_token_expires": token_expires,
                 "scopes": scopes,
             }
         )
         
-        if not result or not result.get("results"):
+        if not result or not result.get("success"):
             raise Exception("Failed to create user")
         
+        conflicts = [row for row in result["results"] if row['status'] == 'conflict']
+        if any(row['username'] == username for row in conflicts):
+            raise ValueError(f"Username '{username}' is already taken")
+        if conflicts:
+            raise ValueError(f"Email '{email}' is already registered")
+        if not result["results"]:
+            raise ValueError("Username or email is already registered")
+        
         user_info = result["results"][0]
         is_admin = 'admin' in (user_info.get('scopes') or [])
+        verification_token = self.generate_verification_token(user_info['id'], token_expires)
         
-        # Send verification email (if requested and email provider is configured)
+        # Queue verification email (if requested and email provider is configured)
         email_status = {"sent": False, "reason": "not requested"}
         if send_verification_email:
-            email_status = {"sent": False, "reason": "not attempted"}
-            try:
-                email_status = self._send_verification_email(email, verification_token, username)
-            except Exception as e:
-                # Don't fail registration if email fails
-                print(f"Warning: Failed to send verification email: {e}")
-                email_status = {"sent": False, "reason": str(e)}
+            email_status = self._queue_verification_email(email, verification_token, username)
+        
+        if email_status.get("queued"):
+            message = _MSG_REGISTERED_EMAIL_QUEUED
+        else:
+            message = _MSG_REGISTERED_NO_EMAIL
         
         return {
             "id": user_info['id'],
@@ -213,13 +393,27 @@ class UserService:
             "email_verified": False,
             "verification_email": email_status,
             "created_at": user_info['created_at'].isoformat(),
-            "message": "Registration successful!" + (
-                " Verification email sent — check your inbox."
-                if email_status.get("sent")
-                else " No verification email sent (email provider not configured)."
-            ),
+            "message": message,
         }
     
+    def _queue_verification_email(
+        self,
+        email: str,
+        token: str,
+        username: str,
+    ) -> dict:
+        """Hand the verification email to the background pool and return immediately.
+        
+        Delivery failures are logged by the worker and never fail registration.
+        """
+        if not email_service.is_configured:
+            # Nothing to send; report the reason synchronously
+            return self._send_verification_email(email, token, username)
+        
+        future = _email_pool.submit(self._send_verification_email, email, token, username)
+        future.add_done_callback(_log_email_failure)
+        return {"sent": False, "queued": True}
+    
     def _send_verification_email(
         self,
         email: str,
@@ -268,42 +462,90 @@ class UserService:
         Raises:
             Exception if token is invalid or expired
         """
-        # Find user with this token
-        query = """
-            SELECT id, username, email, verification_token_expires, email_verified
-            FROM users
-            WHERE verification_token = %(token)s
-        """
-        
-        result = self.db.execute_query(query, {"token": token})
-        
-        if not result or not result.get("results"):
-            raise ValueError("Invalid verification token")
-        
-        user = result["results"][0]
-        
-        if user['email_verified']:
-            return {
-                "success": True,
-                "message": "Email already verified",
-                "username": user['username'],
-            }
+        # Common path: verify in a single UPDATE, with the expiry compared in
+        # the database (the column holds naive UTC timestamps)
+        parsed = _parse_verification_token(token)
+        if parsed is not None:
+            # Signed token: primary-key match, and only the latest token issued
+            user_id, expires_epoch = parsed
+            expires_at = datetime.fromtimestamp(expires_epoch, timezone.utc).replace(tzinfo=None)
+            update_query = """
+                UPDATE users
+                SET email_verified = true,
+                    verification_token = NULL,
+                    verification_token_expires = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = $1
+                  AND verification_token_expires = $2
+                  AND verification_token_expires > (NOW() AT TIME ZONE 'UTC')
+                  AND NOT email_verified
+                RETURNING id, username, email
+            """
+            result = self.db.execute_query(
+                update_query,
+                (user_id, expires_at),
+                statement_name="user_service_verify_signed_token",
+            )
+        else:
+            # Opaque token issued before signed tokens, stored on the user row
+            update_query = """
+                UPDATE users
+                SET email_verified = true,
+                    verification_token = NULL,
+                    verification_token_expires = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE verification_token = $1
+                  AND verification_token_expires > (NOW() AT TIME ZONE 'UTC')
+                  AND NOT email_verified
+                RETURNING id, username, email
+            """
+            result = self.db.execute_query(
+                update_query, (token,), statement_name="user_service_verify_stored_token"
+            )
         
-        # Check if token expired
-        if datetime.utcnow() > user['verification_token_expires']:
+        if not result.get("success"):
+            raise Exception(f"Failed to verify email: {result.get('error', 'Unknown error')}")
+        
+        if not result["results"]:
+            # Nothing updated; look the token up only to explain why
+            if parsed is not None:
+                query = """
+                    SELECT username, verification_token_expires, email_verified
+                    FROM users
+                    WHERE id = $1
+                """
+                result = self.db.execute_query(
+                    query, (user_id,), statement_name="user_service_user_by_id_for_verification"
+                )
+            else:
+                query = """
+                    SELECT username, verification_token_expires, email_verified
+                    FROM users
+                    WHERE verification_token = $1
+                """
+                result = self.db.execute_query(
+                    query, (token,), statement_name="user_service_user_by_token"
+                )
+            
+            if not result.get("results"):
+                raise ValueError("Invalid verification token")
+            
+            user = result["results"][0]
+            
+            if user['email_verified']:
+                return {
+                    "success": True,
+                    "message": "Email already verified",
+                    "username": user['username'],
+                }
+            
+            if parsed is not None and user['verification_token_expires'] != expires_at:
+                raise ValueError("Invalid verification token")
+            
             raise ValueError("Verification token has expired. Please request a new one.")
         
-        # Update user as verified
-        update_query = """
-            UPDATE users
-            SET email_verified = true,
-                verification_token = NULL,
-                verification_token_expires = NULL,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = %(user_id)s
-        """
-        
-        self.db.execute_query(update_query, {"user_id": user['id']})
+        user = result["results"][0]
+        _user_cache_discard(user['username'])
         
         return {
             "success": True,
@@ -326,10 +568,10 @@ class UserService:
         query = """
             SELECT id, username, email, email_verified
             FROM users
-            WHERE email = %(email)s
+            WHERE LOWER(email) = LOWER(%(email)s)
         """
         
-        result = self.db.execute_query(query, {"email": email})
+        result = self.db.execute_query(query, {"email": email.strip().lower()})
         
         if not result or not result.get("results"):
             raise ValueError("No account found with this email")
@@ -342,14 +584,14 @@ class UserService:
                 "message": "Email is already verified",
             }
         
-        # Generate new token
-        verification_token = self.generate_verification_token()
-        token_expires = datetime.utcnow() + timedelta(hours=24)
+        # Generate new token; the new expiry supersedes any earlier token
+        token_expires = (datetime.utcnow() + _VERIFICATION_TOKEN_TTL).replace(microsecond=0)
+        verification_token = self.generate_verification_token(user['id'], token_expires)
         
         # Update token
         update_query = """
             UPDATE users
-            SET verification_token = %(token)s,
+            SET verification_token = NULL,
                 verification_token_expires = %(expires)s,
                 updated_at = CURRENT_TIMESTAMP
             WHERE id = %(user_id)s
@@ -358,10 +600,10 @@ class UserService:
         self.db.execute_query(
             update_query,
             {
-                "token": verification_token,
                 "expires": token_expires,
                 "user_id": user['id'],
-            }
+            },
+            fetch_results=False,
         )
         
         # Send email (we'll implement this async in the actual call)
@@ -382,21 +624,27 @@ class UserService:
         Returns:
             User dict or None if not found
         """
+        cached = _user_cache_get(username)
+        if cached is not None:
+            return cached
+        
         query = """
             SELECT id, username, email, full_name, hashed_password,
                    disabled, scopes, email_verified, created_at
             FROM users
-            WHERE username = %(username)s
+            WHERE username = $1
         """
         
-        result = self.db.execute_query(query, {"username": username})
+        result = self.db.execute_query(
+            query, (username,), statement_name="user_service_user_by_username"
+        )
         
         # Check if query was successful and has results
         if not result.get("success") or not result.get("results"):
             return None
         
         user = result["results"][0]
-        return {
+        user_dict = {
             "id": user['id'],
             "username": user['username'],
             "email": user['email'],
@@ -406,6 +654,8 @@ class UserService:
             "scopes": user['scopes'],
             "email_verified": user['email_verified'],
         }
+        _user_cache_set(username, user_dict)
+        return user_dict
     
     def update_user(
         self,
@@ -433,72 +683,73 @@ class UserService:
         Raises:
             ValueError if user not found or email already in use
         """
-        # Check if user exists
-        existing = self.get_user_by_username(username)
-        if not existing:
-            raise ValueError(f"User '{username}' not found")
-        
-        # Build dynamic update query
-        updates = []
-        params = {"username": username}
+        if all(value is None for value in (email, password, full_name, disabled, admin)):
+            raise ValueError("No fields to update")
         
         if email is not None:
-            # Check if email is already used by another user
-            check_query = """
-                SELECT username FROM users WHERE email = %(email)s AND username != %(username)s
-            """
-            check_result = self.db.execute_query(check_query, {"email": email, "username": username})
-            if check_result.get("results"):
-                raise ValueError(f"Email '{email}' is already in use by another user")
-            updates.append("email = %(email)s")
-            params["email"] = email
+            email = email.strip().lower()
+            if not _EMAIL_RE.fullmatch(email):
+                raise ValueError("Invalid email address")
         
+        hashed_password = None
         if password is not None:
             if len(password) < 8:
                 raise ValueError("Password must be at least 8 characters")
-            hashed = self.hash_password(password)
-            updates.append("hashed_password = %(hashed_password)s")
-            params["hashed_password"] = hashed
-        
-        if full_name is not None:
-            updates.append("full_name = %(full_name)s")
-            params["full_name"] = full_name
-        
-        if disabled is not None:
-            updates.append("disabled = %(disabled)s")
-            params["disabled"] = disabled
-        
-        if admin is not None:
-            # Modify scopes based on admin flag
-            current_scopes = existing.get("scopes", ["read", "write"])
-            if admin:
-                # Add admin scope if not present
-                if "admin" not in current_scopes:
-                    current_scopes.append("admin")
-            else:
-                # Remove admin scope if present
-                current_scopes = [s for s in current_scopes if s != "admin"]
-            updates.append("scopes = %(scopes)s")
-            params["scopes"] = current_scopes
-        
-        if not updates:
-            raise ValueError("No fields to update")
-        
-        # Add updated_at
-        updates.append("updated_at = NOW()")
+            hashed_password = self.hash_password(password)
         
-        update_query = f"""
-            UPDATE users
-            SET {', '.join(updates)}
-            WHERE username = %(username)s
-            RETURNING id, username, email, full_name, disabled, scopes, updated_at
+        # Email check and update in one round trip. NULL parameters leave the
+        # column unchanged; an email conflict comes back as status
+        # 'email_taken', and no rows at all means the user doesn't exist.
+        update_query = """
+            WITH email_taken AS (
+                SELECT 1 FROM users
+                WHERE %(email)s::text IS NOT NULL
+                  AND LOWER(email) = LOWER(%(email)s::text)
+                  AND username <> %(username)s
+                LIMIT 1
+            ), updated AS (
+                UPDATE users
+                SET email = COALESCE(%(email)s, email),
+                    hashed_password = COALESCE(%(hashed_password)s, hashed_password),
+                    full_name = COALESCE(%(full_name)s, full_name),
+                    disabled = COALESCE(%(disabled)s, disabled),
+                    scopes = CASE
+                        WHEN %(admin)s IS NULL THEN scopes
+                        WHEN %(admin)s THEN array_append(array_remove(scopes, 'admin'), 'admin')
+                        ELSE array_remove(scopes, 'admin')
+                    END,
+                    updated_at = NOW()
+                WHERE username = %(username)s
+                  AND NOT EXISTS (SELECT 1 FROM email_taken)
+                RETURNING id, username, email, full_name, disabled, scopes, updated_at
+            )
+            SELECT 'updated' AS status, id, username, email, full_name, disabled, scopes, updated_at
+            FROM updated
+            UNION ALL
+            SELECT 'email_taken', NULL, NULL, NULL, NULL, NULL, NULL, NULL
+            FROM email_taken
         """
         
-        result = self.db.execute_query(update_query, params)
+        result = self.db.execute_query(
+            update_query,
+            {
+                "username": username,
+                "email": email,
+                "hashed_password": hashed_password,
+                "full_name": full_name,
+                "disabled": disabled,
+                "admin": admin,
+            }
+        )
         
-        if not result.get("success") or not result.get("results"):
+        if not result.get("success"):
             raise Exception(f"Failed to update user: {result.get('error', 'Unknown error')}")
+        if not result["results"]:
+            raise ValueError(f"User '{username}' not found")
+        if result["results"][0]["status"] == "email_taken":
+            raise ValueError(f"Email '{email}' is already in use by another user")
         
+        _user_cache_discard(username)
         updated_user = result["results"][0]
         user_scopes = updated_user.get("scopes", [])
         return {
@@ -512,15 +763,15 @@ class UserService:
             "updated_at": updated_user["updated_at"].isoformat() if updated_user.get("updated_at") else None,
         }
     
-    def list_users(self, admin_only: bool = False) -> list[Dict[str, Any]]:
+    def iter_users(self, admin_only: bool = False) -> Iterator[Dict[str, Any]]:
         """
-        List all users (admin function).
+        Stream users (admin function) without loading the whole table.
         
         Args:
-            admin_only: If True, only return admin users
+            admin_only: If True, only yield admin users
             
-        Returns:
-            List of user dicts (without passwords)
+        Yields:
+            User dicts (without passwords), newest first
         """
         if admin_only:
             query = """
@@ -538,24 +789,31 @@ class UserService:
                 ORDER BY created_at DESC
             """
         
-        result = self.db.execute_query(query, {})
+        rows = map(_list_user_row, self.db.iter_query(query))
+        try:
+            for user_id, username, email, full_name, disabled, scopes, email_verified, created_at in rows:
+                yield {
+                    "id": user_id,
+                    "username": username,
+                    "email": email,
+                    "full_name": full_name,
+                    "disabled": disabled,
+                    "admin": "admin" in (scopes or ()),
+                    "scopes": scopes,
+                    "email_verified": email_verified,
+                    "created_at": created_at.isoformat() if created_at else None,
+                }
+        except Exception as e:
+            raise Exception(f"Failed to list users: {e}") from e
+    
+    def list_users(self, admin_only: bool = False) -> list[Dict[str, Any]]:
+        """
+        List all users (admin function).
         
-        if not result.get("success"):
-            raise Exception(f"Failed to list users: {result.get('error', 'Unknown error')}")
-        
-        users = []
-        for user in result.get("results", []):
-            user_scopes = user.get("scopes", [])
-            users.append({
-                "id": user["id"],
-                "username": user["username"],
-                "email": user["email"],
-                "full_name": user["full_name"],
-                "disabled": user["disabled"],
-                "admin": "admin" in user_scopes,
-                "scopes": user_scopes,
-                "email_verified": user["email_verified"],
-                "created_at": user["created_at"].isoformat() if user.get("created_at") else None,
-            })
-        
-        return users
+        Args:
+            admin_only: If True, only return admin users
+            
+        Returns:
+            List of user dicts (without passwords)
+        """
+        return list(self.iter_users(admin_only))